@@ -1,21 +1,23 @@
 import os
-import sys
 import json
 import re
 import argparse
+import functools
+import hashlib
+import sqlite3
+import threading
 import time
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from zoneinfo import ZoneInfo
 import io
 
-import pandas as pd
 import praw
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-from openai import OpenAI
-import gspread
-from google.oauth2.service_account import Credentials
 import finnhub
 from alpha_vantage.fundamentaldata import FundamentalData
 
@@ -36,15 +38,9 @@ def check_environment_variables():
         "GOOGLE_NEWS_SHEET_NAME", "GOOGLE_CALENDAR_SHEET_NAME", "FINNHUB_API_KEY",
         "ALPHA_VANTAGE_API_KEY"
     ]
-    missing_vars = []
     print("--- Checking Environment Variables ---")
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
-            print(f"- {var}: MISSING!")
-        else:
-            print(f"- {var}: Found.")
-    
+    # Empty values count as missing, same as an unset variable.
+    missing_vars = [var for var in required_vars if not os.environ.get(var)]
     if missing_vars:
         raise ValueError(
             f"The following required environment variables are missing: {', '.join(missing_vars)}. "
@@ -55,14 +51,29 @@ def check_environment_variables():
 check_environment_variables()
 
 # --- API Client Setup ---
+# praw.Reddit is not thread-safe, so every Reddit call stays on one thread.
 reddit = praw.Reddit(
     client_id=os.getenv("CLIENT_ID"),
     client_secret=os.getenv("CLIENT_SECRET"),
     user_agent=os.getenv("USER_AGENT"),
 )
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 finnhub_client = finnhub.Client(api_key=os.getenv("FINNHUB_API_KEY"))
 alpha_vantage_client = FundamentalData(key=os.getenv("ALPHA_VANTAGE_API_KEY"))
+# Shared keep-alive session for webhooks and Alpha Vantage. 5xx/read retries are GET-only (webhook POSTs aren't
+# idempotent); 429s are left to post_to_webhook.
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504], allowed_methods=frozenset({"GET"})),
+))
+
+
+@functools.lru_cache(maxsize=1)
+def get_openai_client():
+    """Lazily imports and builds the shared OpenAI client, so scans that never call the API skip the import."""
+    from openai import OpenAI
+    # max_retries lets the SDK back off exponentially on 429s when calls run concurrently.
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=5)
 
 
 # --- Discord Configuration ---
@@ -78,41 +89,84 @@ WEBHOOKS = {
 TARGET_SUBREDDITS = [
     "wallstreetbets", "shortsqueeze", "WallStreetbetsELITE", "smallstreetbets"
 ]
+# Set REDDIT_COMBINED_LISTING=0 to scrape each subreddit's /new listing separately instead of one r/a+b+c listing.
+REDDIT_COMBINED_LISTING = os.getenv("REDDIT_COMBINED_LISTING", "1") != "0"
+# How far past the high-water mark to keep reading, for posts that surface late (e.g. modqueue approvals).
+LAST_SEEN_SLACK_SECONDS = 6 * 3600
 OUTPUT_DIR = "data"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
-PROCESSED_POSTS_FILE = os.path.join(OUTPUT_DIR, "processed_posts.txt")
+PROCESSED_POSTS_FILE = os.path.join(OUTPUT_DIR, "processed_posts.txt")  # Legacy store, imported into PROCESSED_DB_FILE.
+PROCESSED_DB_FILE = os.path.join(OUTPUT_DIR, "processed.db")
+PROCESSED_RETENTION_DAYS = 7  # Comfortably longer than the 2-day scrape window.
 DAILY_SUMMARY_LOG_FILE = os.path.join(OUTPUT_DIR, "daily_summary_log.txt")
+ECON_CALENDAR_CSV_FILE = os.path.join(OUTPUT_DIR, "econ_calendar.csv")  # Last downloaded calendar, reused on a 304.
+ECON_CALENDAR_ETAG_FILE = os.path.join(OUTPUT_DIR, "econ_calendar.etag")
+# Media-only posts carry no thesis text, so they are dropped before any comment fetch or AI call.
+# Extend the pattern (not the scrape loop) to cover new media hosts or file types.
+MEDIA_URL_RE = re.compile(r"\.(?:jpe?g|png|gif|webp|mp4)(?:$|\?)|(?:v|i)\.redd\.it|imgur\.com", re.IGNORECASE)
+INVALID_TICKERS = frozenset({"N/A", "MULTI_STOCK"})  # Model placeholders meaning "no single ticker".
+# Optional whitespace-separated symbol list. Without it, any cashtag (any case) or all-caps non-jargon word counts.
+TICKERS_FILE = os.path.join(OUTPUT_DIR, "tickers.txt")
+TICKER_RE = re.compile(r"\$([A-Za-z]{1,5})\b|\b([A-Z]{1,5})\b")  # Groups: (cashtag symbol, bare all-caps symbol).
+NON_TICKER_WORDS = frozenset({
+    "A", "I", "AI", "AM", "AND", "ARE", "ATH", "BUY", "CEO", "CFO", "CPI", "DD", "EOD", "EPS", "ETF", "EV", "FDA", "FED",
+    "FOR", "FOMO", "FYI", "GDP", "HOLD", "IMO", "IPO", "IRS", "IT", "ITM", "IV", "LOL", "MOASS", "NOT", "NYSE", "OP", "OTM",
+    "PM", "PT", "SEC", "SELL", "THE", "TLDR", "TO", "UK", "US", "USA", "USD", "WSB", "YOLO", "YTD",
+})
+AI_CACHE_DB_FILE = os.path.join(OUTPUT_DIR, "ai_cache.sqlite")
+AI_CACHE_RETENTION_DAYS = 30  # Older analyses are for posts long out of the scrape window.
+SYSTEM_PROMPT_VERSION = "2"  # Bump whenever the synthesis prompt changes to invalidate cached analyses.
+AI_MAX_WORKERS = 8  # Concurrent requests in flight against the OpenAI API.
+AI_BATCH_SIZE = 5  # Posts packed into a single chat completion.
+AI_BATCH_TOKEN_BUDGET = 6000  # Approximate input tokens per batched request.
+TRIAGE_MODEL = "gpt-4o-mini"  # Cheap first-pass scorer; only promising posts reach FULL_ANALYSIS_MODEL.
+FULL_ANALYSIS_MODEL = "gpt-4o"
+TRIAGE_BATCH_SIZE = 10  # Triage prompts omit comments, so more posts fit per request.
+TRIAGE_THRESHOLD = 3.0  # Minimum triage confidence to fetch comments and run the full analysis.
 
 
 # ---------------------------
 # Google Sheets Client
 # ---------------------------
 
+@functools.lru_cache(maxsize=1)
 def get_gspread_client():
-    """Initializes and returns an authenticated gspread client."""
+    """Initializes and returns an authenticated gspread client, reused for the life of the process."""
+    # Imported here so scans that never touch Sheets don't pay for loading gspread/google-auth.
+    import gspread
+    from google.oauth2.service_account import Credentials
     creds_json = json.loads(os.getenv("GOOGLE_CREDENTIALS_JSON"))
     scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
     creds = Credentials.from_service_account_info(creds_json, scopes=scopes)
     return gspread.authorize(creds)
 
+@functools.lru_cache(maxsize=4)
+def _spreadsheet(spreadsheet_name):
+    """Returns a cached spreadsheet handle, shared by every tab written within it."""
+    return get_gspread_client().open(spreadsheet_name)
+
+@functools.lru_cache(maxsize=8)
+def _worksheet(spreadsheet_name, worksheet_name):
+    """Returns a cached worksheet handle so repeat writes skip re-opening the spreadsheet."""
+    return _spreadsheet(spreadsheet_name).worksheet(worksheet_name)
+
 def write_to_sheet(spreadsheet_name, worksheet_name, rows_to_append, clear_sheet=False, header=None):
     """A robust function to write data to a specific worksheet (tab) within a spreadsheet."""
+    import gspread
     if not rows_to_append:
         print(f"No data to write to sheet '{spreadsheet_name} -> {worksheet_name}'.")
         return
     
     print(f"Attempting to write {len(rows_to_append)} rows to Google Sheet: {spreadsheet_name} -> {worksheet_name}...")
     try:
-        gc = get_gspread_client()
-        spreadsheet = gc.open(spreadsheet_name)
-        worksheet = spreadsheet.worksheet(worksheet_name)
+        worksheet = _worksheet(spreadsheet_name, worksheet_name)
         
         if clear_sheet:
+            # Replace the tab's contents with a single values update instead of separate header/row appends.
             worksheet.clear()
-            if header:
-                worksheet.append_row(header)
-        
-        worksheet.append_rows(rows_to_append)
+            worksheet.update(range_name="A1", values=([header] if header else []) + rows_to_append)
+        else:
+            worksheet.append_rows(rows_to_append)
         print(f"Successfully wrote data to '{spreadsheet_name} -> {worksheet_name}'.")
     except gspread.exceptions.SpreadsheetNotFound:
         print(f"ERROR: Spreadsheet '{spreadsheet_name}' not found. Please check the name and sharing permissions.")
@@ -124,18 +178,199 @@ def write_to_sheet(spreadsheet_name, worksheet_name, rows_to_append, clear_sheet
         print(f"An unexpected error occurred while writing to Google Sheets: {e}")
         traceback.print_exc()
 
+_pending_sheet_rows = {}  # (spreadsheet_name, worksheet_name) -> rows waiting for flush_sheet_writes().
+_pending_sheet_lock = threading.Lock()
+
+def queue_sheet_write(spreadsheet_name, worksheet_name, rows_to_append):
+    """Buffers rows for a tab so a scan's appends go out together in flush_sheet_writes()."""
+    if not rows_to_append: return
+    with _pending_sheet_lock:
+        _pending_sheet_rows.setdefault((spreadsheet_name, worksheet_name), []).extend(rows_to_append)
+
+def _cell_data(value):
+    """Converts a Python value to a Sheets CellData entry, matching append_rows' RAW input."""
+    if value is None: return {}
+    if isinstance(value, bool): return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)): return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+def flush_sheet_writes():
+    """Appends all queued rows with one batchUpdate per spreadsheet, falling back to per-tab appends if it fails."""
+    with _pending_sheet_lock:
+        pending = dict(_pending_sheet_rows)
+        _pending_sheet_rows.clear()
+    by_spreadsheet = {}
+    for (spreadsheet_name, worksheet_name), rows in pending.items():
+        by_spreadsheet.setdefault(spreadsheet_name, []).append((worksheet_name, rows))
+
+    for spreadsheet_name, tabs in by_spreadsheet.items():
+        # Resolve tabs one at a time so a misconfigured tab only loses its own rows.
+        resolved = []
+        for worksheet_name, rows in tabs:
+            try:
+                resolved.append((worksheet_name, rows, _worksheet(spreadsheet_name, worksheet_name).id))
+            except Exception as e:
+                print(f"ERROR: Could not open '{spreadsheet_name} -> {worksheet_name}'; skipping its {len(rows)} rows: {e!r}")
+        if not resolved: continue
+
+        print(f"Attempting to write {sum(len(rows) for _, rows, _ in resolved)} rows across {len(resolved)} tab(s) of Google Sheet: {spreadsheet_name}...")
+        try:
+            _spreadsheet(spreadsheet_name).batch_update({"requests": [{
+                "appendCells": {
+                    "sheetId": sheet_id,
+                    "rows": [{"values": [_cell_data(v) for v in row]} for row in rows],
+                    "fields": "userEnteredValue",
+                }
+            } for _, rows, sheet_id in resolved]})
+            print(f"Successfully wrote data to '{spreadsheet_name}' ({', '.join(name for name, _, _ in resolved)}).")
+        except Exception as e:
+            # batchUpdate is all-or-nothing; retry each tab alone so one bad tab can't drop the others' rows.
+            print(f"Batched write to '{spreadsheet_name}' failed ({e}); retrying each tab separately...")
+            for worksheet_name, rows, _ in resolved:
+                write_to_sheet(spreadsheet_name, worksheet_name, rows)
+
+
+# ---------------------------
+# Discord Webhook Client
+# ---------------------------
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter allowing at most `max_calls` acquisitions per `period` seconds."""
+
+    def __init__(self, max_calls, period):
+        self.max_calls, self.period = max_calls, period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period: self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
+
+# Discord allows 5 webhook requests per 2 seconds; staying under it client-side avoids most 429 round-trips.
+_discord_limiter = RateLimiter(max_calls=5, period=2.0)
+
+def post_to_webhook(url, payload, timeout=15, max_attempts=3):
+    """POSTs a payload to a Discord webhook, waiting as long as Discord's rate-limit headers ask on a 429 or drained bucket."""
+    for attempt in range(max_attempts):
+        _discord_limiter.acquire()
+        response = _http.post(url, json=payload, timeout=timeout)
+        if response.status_code == 429 and attempt < max_attempts - 1:
+            retry_after = float(response.headers.get("Retry-After", 1))
+            print(f"Discord rate limit hit; retrying in {retry_after:.2f}s...")
+            time.sleep(retry_after)
+            continue
+        response.raise_for_status()
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            time.sleep(float(response.headers.get("X-RateLimit-Reset-After", 0)))
+        return response
+
 
 # ---------------------------
 # Memory/Cache Functions
 # ---------------------------
 
-def load_processed_ids():
-    if not os.path.exists(PROCESSED_POSTS_FILE): return set()
-    with open(PROCESSED_POSTS_FILE, 'r') as f: return {line.strip() for line in f}
+def _write_atomic(path, data):
+    """Writes `data` (str or bytes) to a temp file and renames it over `path`, so readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb' if isinstance(data, bytes) else 'w') as f: f.write(data)
+    os.replace(tmp_path, path)
+
+def _open_processed_db():
+    conn = sqlite3.connect(PROCESSED_DB_FILE)
+    conn.execute("CREATE TABLE IF NOT EXISTS processed (id TEXT PRIMARY KEY, seen_at INTEGER)")
+    conn.execute("CREATE TABLE IF NOT EXISTS last_seen (subreddit TEXT PRIMARY KEY, created_utc REAL)")
+    # One-time import of the legacy flat file so already-posted plays are not re-analyzed after upgrading.
+    if os.path.exists(PROCESSED_POSTS_FILE) and conn.execute("SELECT 1 FROM processed LIMIT 1").fetchone() is None:
+        with open(PROCESSED_POSTS_FILE, 'r') as f: legacy_ids = {line.strip() for line in f if line.strip()}
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO processed (id, seen_at) VALUES (?, ?)",
+                             [(post_id, int(time.time())) for post_id in legacy_ids])
+    return conn
+
+def load_processed_ids(post_ids):
+    """Returns the subset of `post_ids` already processed within the retention window."""
+    if not post_ids: return set()
+    cutoff = int(time.time()) - PROCESSED_RETENTION_DAYS * 86400
+    conn = _open_processed_db()
+    try:
+        placeholders = ",".join("?" * len(post_ids))
+        rows = conn.execute(f"SELECT id FROM processed WHERE seen_at > ? AND id IN ({placeholders})", [cutoff, *post_ids])
+        return {row[0] for row in rows}
+    finally:
+        conn.close()
 
 def save_processed_ids(ids_to_save):
-    with open(PROCESSED_POSTS_FILE, 'a') as f:
-        for post_id in ids_to_save: f.write(f"{post_id}\n")
+    """Records newly processed post IDs and prunes entries older than the retention window."""
+    now = int(time.time())
+    conn = _open_processed_db()
+    try:
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO processed (id, seen_at) VALUES (?, ?)", [(post_id, now) for post_id in ids_to_save])
+            conn.execute("DELETE FROM processed WHERE seen_at < ?", (now - PROCESSED_RETENTION_DAYS * 86400,))
+    finally:
+        conn.close()
+
+def load_last_seen():
+    """Returns {subreddit (lowercase): newest post creation time already scraped}."""
+    conn = _open_processed_db()
+    try:
+        return dict(conn.execute("SELECT subreddit, created_utc FROM last_seen"))
+    finally:
+        conn.close()
+
+def save_last_seen(newest_seen):
+    if not newest_seen: return
+    conn = _open_processed_db()
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO last_seen (subreddit, created_utc) VALUES (?, ?) "
+                "ON CONFLICT(subreddit) DO UPDATE SET created_utc = MAX(created_utc, excluded.created_utc)",
+                list(newest_seen.items()))
+    finally:
+        conn.close()
+
+def _ai_cache_key(item):
+    """Hashes the prompt version and the exact content sent to the model for a post."""
+    content = f"{SYSTEM_PROMPT_VERSION}|{item['title']}|{item['selftext']}|{item['comments']}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def _open_ai_cache():
+    conn = sqlite3.connect(AI_CACHE_DB_FILE)
+    conn.execute("PRAGMA journal_mode=WAL")  # Cache reads don't block on the end-of-scan write.
+    conn.execute("CREATE TABLE IF NOT EXISTS cache (hash TEXT PRIMARY KEY, json TEXT, ts INTEGER)")
+    return conn
+
+def load_cached_analyses(keys):
+    """Returns a {hash: analysis} dict for every key already present in the AI cache."""
+    if not keys: return {}
+    conn = _open_ai_cache()
+    try:
+        placeholders = ",".join("?" * len(keys))
+        rows = conn.execute(f"SELECT hash, json FROM cache WHERE hash IN ({placeholders})", list(keys)).fetchall()
+        return {h: json.loads(payload) for h, payload in rows}
+    finally:
+        conn.close()
+
+def save_cached_analyses(analyses_by_key):
+    """Stores fresh analyses and prunes entries older than the cache retention window."""
+    if not analyses_by_key: return
+    conn = _open_ai_cache()
+    try:
+        now = int(time.time())
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO cache (hash, json, ts) VALUES (?, ?, ?)",
+                             [(h, json.dumps(analysis), now) for h, analysis in analyses_by_key.items()])
+            conn.execute("DELETE FROM cache WHERE ts < ?", (now - AI_CACHE_RETENTION_DAYS * 86400,))
+    finally:
+        conn.close()
 
 # ---------------------------
 # Reddit Scan Logic
@@ -146,83 +381,242 @@ def get_comments_for_post(post_id, limit=25):
         print(f"Fetching comments for post ID: {post_id}...")
         submission = reddit.submission(id=post_id)
         submission.comment_sort = "top"
+        # No comment_limit: Reddit applies it to the whole tree, replies included.
+        submission.comments.replace_more(limit=0)  # Drop "load more" stubs rather than fetching them.
         comments = [comment.body for comment in submission.comments[:limit] if not comment.stickied]
-        time.sleep(1) 
         return "\n".join(comments)
     except Exception as e:
         print(f"Could not fetch comments for post {post_id}: {e}")
         return ""
 
-def scrape_new_posts(subreddits, processed_ids):
-    all_posts_data = []
-    now = datetime.now(timezone.utc)
-    for sub in subreddits:
-        print(f"Fetching posts from r/{sub}...")
-        posts = list(reddit.subreddit(sub).new(limit=100))
-        for p in posts:
-            if p.id in processed_ids: continue
-            created = datetime.fromtimestamp(p.created_utc, timezone.utc)
-            if created < now - timedelta(days=2): continue
-            if p.url.endswith((".jpeg", ".png")) or "v.redd.it" in p.url: continue
-            all_posts_data.append({
-                "id": p.id, "subreddit": sub, "title": p.title, "selftext": p.selftext,
-                "url": f"https://reddit.com{p.permalink}", "created_utc": created.isoformat(),
-                "score": p.score, "num_comments": p.num_comments
-            })
-    return all_posts_data
-
-def get_ai_synthesis(post_data, comments_text):
-    print(f"Sending post '{post_data['title']}' for AI synthesis...")
-    system_prompt = """
-    You are an expert retail investor, skilled at replicating the intuitive process of a human analyst to find actionable trading ideas on Reddit.
-    Your primary goal is to synthesize the original post with the community's reaction in the comments to form a holistic view.
-
-    **Analysis Steps & Output Fields:**
-    You will be given the original post and a sample of its top comments. Based on BOTH, generate:
-    1.  `ticker`: The SINGLE stock ticker discussed. If multiple or none, return "N/A".
-    2.  `briefing`: A synthesis of the post and comments. What is the core thesis? How did the community react? Are there strong counterarguments or validations?
-    3.  `the_play`: The community-vetted actionable takeaway. What is the real play after considering the comments? If none, state "No clear play identified."
-    4.  `confidence_score`: A score from 0.0 to 10.0. This score MUST reflect the combined quality of the original thesis AND the community's reception. A great idea torn apart by comments should receive a LOW score.
-
-    **Core Rules for Scoring:**
-    - If `ticker` is "N/A", the `confidence_score` MUST be 0.0.
-    - **High Confidence (8.0-10.0):** A clear, well-reasoned thesis with strong, positive validation in the comments.
-    - **Medium Confidence (4.0-7.9):** A decent thesis with mixed or moderate community feedback.
-    - **Low Confidence (0.1-3.9):** A speculative idea, or a good idea that was heavily criticized in the comments.
-    - **Zero Confidence (0.0):** No actionable play, a question, or a post that was thoroughly debunked by the community.
-
-    Your entire response must be a single, valid JSON object. Do not include any other text, explanations, or markdown.
-    """
-    user_prompt = f"**Original Post Title:** {post_data['title']}\n\n**Original Post Body:**\n{post_data['selftext']}\n\n**Top Comments:**\n{comments_text}"
+def _scan_new_listing(subreddits, last_seen, cutoff_ts):
+    """Scans the merged /new listing of `subreddits` (r/a+b+c), returning (posts, newest_seen) for that listing."""
+    listing = "+".join(subreddits)
+    print(f"Fetching posts from r/{listing}...")
+    posts_data, newest_utc = [], 0
+    # Newest-first, so stop at the listing's mark less the slack; a subreddit with no mark yet means the cutoff.
+    caught_up_utc = min(last_seen.get(sub.lower(), cutoff_ts) for sub in subreddits) - LAST_SEEN_SLACK_SECONDS
+    for p in reddit.subreddit(listing).new(limit=100 * len(subreddits)):
+        if p.created_utc <= caught_up_utc: break
+        if p.created_utc < cutoff_ts: break  # Everything further down the listing is older still.
+        newest_utc = max(newest_utc, p.created_utc)
+        if MEDIA_URL_RE.search(p.url): continue
+        posts_data.append({
+            "id": p.id, "subreddit": p.subreddit.display_name, "title": p.title, "selftext": p.selftext,
+            "url": f"https://reddit.com{p.permalink}", "created_utc": datetime.fromtimestamp(p.created_utc, timezone.utc).isoformat(),
+            "score": p.score, "num_comments": p.num_comments
+        })
+    # Scanning the listing down to here covers every subreddit in it, quiet ones included.
+    return posts_data, ({sub.lower(): newest_utc for sub in subreddits} if newest_utc else {})
+
+def scrape_new_posts(subreddits, last_seen):
+    """Returns (unprocessed new posts, each subreddit's new high-water mark for save_last_seen)."""
+    cutoff_ts = (datetime.now(timezone.utc) - timedelta(days=2)).timestamp()
+    if REDDIT_COMBINED_LISTING:
+        # One merged listing shares a single post cap across subreddits but needs far fewer requests.
+        listings = [_scan_new_listing(subreddits, last_seen, cutoff_ts)]
+    else:
+        # Per-subreddit listings give each subreddit its own cap, so one busy subreddit can't crowd out the rest.
+        listings = [_scan_new_listing([sub], last_seen, cutoff_ts) for sub in subreddits]
+    all_posts_data = [post for posts, _ in listings for post in posts]
+    newest_seen = {sub: ts for _, seen in listings for sub, ts in seen.items()}
+    processed_ids = load_processed_ids([post['id'] for post in all_posts_data])
+    return [post for post in all_posts_data if post['id'] not in processed_ids], newest_seen
+
+@functools.lru_cache(maxsize=1)
+def _known_tickers():
+    """Returns the symbol set from TICKERS_FILE, or None when no list is installed."""
+    if not os.path.exists(TICKERS_FILE): return None
+    with open(TICKERS_FILE, 'r') as f: return frozenset(f.read().upper().split())
+
+def likely_ticker(text):
+    """Cheap regex pre-filter: True if the text plausibly names a stock ticker and is worth an AI call."""
+    known = _known_tickers()
+    for cashtag, bare in TICKER_RE.findall(text):
+        symbol = (cashtag or bare).upper()
+        if known is not None:
+            if symbol in known: return True
+        elif cashtag or symbol not in NON_TICKER_WORDS:
+            return True
+    return False
+
+def _estimate_tokens(text):
+    """Rough token count (~4 characters per token) used to size AI batches."""
+    return len(text) // 4
+
+def chunk_ai_items(items, batch_size=TRIAGE_BATCH_SIZE, token_budget=AI_BATCH_TOKEN_BUDGET):
+    """Groups posts into triage batches of at most batch_size posts and roughly token_budget input tokens."""
+    batches, current, current_tokens = [], [], 0
+    for item in items:
+        tokens = _estimate_tokens(item['title'] + item['selftext'])
+        if current and (len(current) >= batch_size or current_tokens + tokens > token_budget):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += tokens
+    if current: batches.append(current)
+    return batches
+
+# Static system prompts keep a shared prefix for OpenAI's prompt caching. Bump SYSTEM_PROMPT_VERSION when editing them.
+TRIAGE_SYSTEM_PROMPT = """
+You are screening Reddit posts for actionable single-stock trading ideas before a more expensive, in-depth review.
+For each numbered post, using only its title and body, return:
+1.  `post`: The number from the post's "--- POST n ---" header, copied exactly.
+2.  `ticker`: The SINGLE stock ticker discussed. If multiple or none, return "N/A".
+3.  `confidence_score`: A rough score from 0.0 to 10.0 of how likely the post contains a concrete, actionable play. If `ticker` is "N/A", it MUST be 0.0.
+
+Your entire response must be a single, valid JSON object of the form {"results": [...]}, where `results` is an array with exactly one object per post.
+Do not include any other text, explanations, or markdown.
+"""
+
+SYNTHESIS_SYSTEM_PROMPT = """
+You are an expert retail investor, skilled at replicating the intuitive process of a human analyst to find actionable trading ideas on Reddit.
+Your primary goal is to synthesize each original post with the community's reaction in its comments to form a holistic view.
+
+**Analysis Steps & Output Fields:**
+You will be given one or more numbered posts, each with a sample of its top comments. Analyze every post independently and, based on BOTH the post and its comments, generate:
+1.  `post`: The number from the post's "--- POST n ---" header, copied exactly.
+2.  `ticker`: The SINGLE stock ticker discussed. If multiple or none, return "N/A".
+3.  `briefing`: A synthesis of the post and comments. What is the core thesis? How did the community react? Are there strong counterarguments or validations?
+4.  `the_play`: The community-vetted actionable takeaway. What is the real play after considering the comments? If none, state "No clear play identified."
+5.  `confidence_score`: A score from 0.0 to 10.0. This score MUST reflect the combined quality of the original thesis AND the community's reception. A great idea torn apart by comments should receive a LOW score.
+
+**Core Rules for Scoring:**
+- If `ticker` is "N/A", the `confidence_score` MUST be 0.0.
+- **High Confidence (8.0-10.0):** A clear, well-reasoned thesis with strong, positive validation in the comments.
+- **Medium Confidence (4.0-7.9):** A decent thesis with mixed or moderate community feedback.
+- **Low Confidence (0.1-3.9):** A speculative idea, or a good idea that was heavily criticized in the comments.
+- **Zero Confidence (0.0):** No actionable play, a question, or a post that was thoroughly debunked by the community.
+
+Your entire response must be a single, valid JSON object of the form {"results": [...]}, where `results` is an array with exactly one analysis object per post.
+Do not include any other text, explanations, or markdown.
+"""
+
+@functools.lru_cache(maxsize=1)
+def _response_models():
+    """Builds the structured-output response models on first use, so pydantic is imported lazily like openai."""
+    from pydantic import BaseModel, Field
+
+    class TriageResult(BaseModel):
+        post: int
+        ticker: str
+        confidence_score: float = Field(ge=0.0, le=10.0)
+
+    class Play(BaseModel):
+        post: int
+        ticker: str
+        briefing: str
+        the_play: str
+        confidence_score: float = Field(ge=0.0, le=10.0)
+
+    class TriageResults(BaseModel):
+        results: list[TriageResult]
+
+    class PlayResults(BaseModel):
+        results: list[Play]
+
+    return {"triage": TriageResults, "synthesis": PlayResults}
+
+def _complete_batch(model, system_prompt, blocks, response_model, temperature):
+    """Analyzes numbered post blocks in one completion. Returns one result dict per block, or all None if the post numbers don't match."""
+    user_prompt = f"Analyze the following {len(blocks)} posts.\n\n" + "\n\n".join(blocks)
+    response = get_openai_client().chat.completions.parse(model=model, messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}], response_format=response_model, temperature=temperature)
+    usage = response.usage
+    if usage:
+        cached_tokens = getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', None) or 0
+        print(f"{model}: {usage.prompt_tokens} prompt tokens ({cached_tokens} served from prompt cache), {usage.completion_tokens} completion tokens.")
+    message = response.choices[0].message
+    if message.parsed is None: raise ValueError(f"model returned no parsed results (refusal: {message.refusal})")
+    results_by_post = {result.post: result.model_dump(exclude={"post"}) for result in message.parsed.results}
+    if len(message.parsed.results) != len(blocks) or set(results_by_post) != set(range(1, len(blocks) + 1)):
+        print(f"AI returned post numbers {sorted(results_by_post)} for a batch of {len(blocks)} posts; discarding the batch.")
+        return [None] * len(blocks)
+    return [results_by_post[i] for i in range(1, len(blocks) + 1)]
+
+def _triage_batch(batch):
+    """Cheaply scores one batch of posts from title and body alone. Returns one triage dict (or None) per post."""
+    print(f"Triaging batch of {len(batch)} posts...")
+    blocks = [f"--- POST {i} ---\nTitle: {item['title']}\nBody: {item['selftext']}" for i, item in enumerate(batch, start=1)]
+    try:
+        return _complete_batch(TRIAGE_MODEL, TRIAGE_SYSTEM_PROMPT, blocks, _response_models()["triage"], temperature=0.0)
+    except Exception as e:
+        print(f"An error occurred during AI triage: {e}"); return [None] * len(batch)
+
+def quick_triage(posts, batch_size=TRIAGE_BATCH_SIZE):
+    """Triage pass over posts with the cheap model. Returns one triage dict (or None on failure) per post, in input order."""
+    batches = chunk_ai_items(posts, batch_size=batch_size)
+    with ThreadPoolExecutor(max_workers=AI_MAX_WORKERS) as executor:
+        batch_results = list(executor.map(_triage_batch, batches))
+    return [result for results in batch_results for result in results]
+
+def _synthesize_batch(batch):
+    """Analyzes one batch of posts in a single chat completion. Returns one analysis (or None) per post, in order."""
+    print(f"Sending batch of {len(batch)} posts for AI synthesis...")
+    blocks = [
+        f"--- POST {i} ---\nTitle: {item['title']}\nBody: {item['selftext']}\nComments:\n{item['comments']}"
+        for i, item in enumerate(batch, start=1)
+    ]
     try:
-        response = openai_client.chat.completions.create(model="gpt-4o", messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}], response_format={"type": "json_object"}, temperature=0.5)
-        analysis = json.loads(response.choices[0].message.content)
-        required_keys = ['ticker', 'briefing', 'the_play', 'confidence_score']
-        if all(key in analysis for key in required_keys): return analysis
-        else: print("AI response was missing required keys."); return None
+        return _complete_batch(FULL_ANALYSIS_MODEL, SYNTHESIS_SYSTEM_PROMPT, blocks, _response_models()["synthesis"], temperature=0.5)
     except Exception as e:
-        print(f"An error occurred during AI synthesis: {e}"); return None
+        print(f"An error occurred during AI synthesis: {e}"); return [None] * len(batch)
+
+def synthesize_posts(posts, batch_size=AI_BATCH_SIZE, token_budget=AI_BATCH_TOKEN_BUDGET):
+    """Fetches comments and analyzes posts, sending each batch to the AI pool as soon as its comments are in. Returns one analysis (or None) per post."""
+    analyses, fresh, keys_by_id = {}, {}, {}
+    ai_futures = []  # (cache keys, future of that batch's analyses)
+    pending, pending_tokens = [], 0
+
+    def dispatch_pending():
+        nonlocal pending, pending_tokens
+        cached = load_cached_analyses({key for key, _ in pending})
+        analyses.update(cached)
+        misses = [(key, item) for key, item in pending if key not in cached]
+        if misses:
+            ai_futures.append(([key for key, _ in misses], ai_executor.submit(_synthesize_batch, [item for _, item in misses])))
+        pending, pending_tokens = [], 0
+
+    with ThreadPoolExecutor(max_workers=AI_MAX_WORKERS) as ai_executor:
+        for post in posts:
+            item = {**post, 'comments': get_comments_for_post(post['id'])}
+            key = keys_by_id[item['id']] = _ai_cache_key(item)
+            tokens = _estimate_tokens(item['title'] + item['selftext'] + item['comments'])
+            if pending and (len(pending) >= batch_size or pending_tokens + tokens > token_budget): dispatch_pending()
+            pending.append((key, item))
+            pending_tokens += tokens
+        if pending: dispatch_pending()
+        for keys, future in ai_futures:
+            fresh.update({key: analysis for key, analysis in zip(keys, future.result()) if analysis})
+
+    if analyses: print(f"AI cache hit for {len(analyses)} of {len(posts)} posts.")
+    save_cached_analyses(fresh)
+    analyses.update(fresh)
+    return [analyses.get(keys_by_id[post['id']]) for post in posts]
+
+def _build_play_payload(play, timestamp):
+    score = float(play.get('confidence_score', 0.0))
+    ticker = play.get('ticker', 'N/A')
+    if score >= 8.0: tag_id, color, emoji = WEBHOOKS.get("tag_id_high"), 0x00C775, "🚀"
+    elif score >= 4.0: tag_id, color, emoji = WEBHOOKS.get("tag_id_medium"), 0xFFFF00, "🤔"
+    else: tag_id, color, emoji = WEBHOOKS.get("tag_id_low"), 0xFF0000, "⛔️"
+    thread_name = f"{ticker} | Confidence: {score:.1f} | {emoji}"
+    embed = {"title": play.get('title', 'No Title'), "description": play.get('briefing', 'No briefing available.'), "color": color, "fields": [{"name": "The Community-Vetted Play", "value": play.get('the_play', 'N/A'), "inline": False}, {"name": "Source", "value": f"r/{play.get('subreddit', 'N/A')}", "inline": True}, {"name": "Link", "value": f"[View Post]({play.get('url', '#')})", "inline": True}], "timestamp": timestamp, "footer": {"text": "Vulture Analysis"}}
+    return {"thread_name": thread_name, "embeds": [embed], "applied_tags": [tag_id] if tag_id else []}
 
 def post_plays_to_discord(plays_data):
     if not plays_data: print("No plays to post to Discord."); return
     print(f"Posting {len(plays_data)} plays to Discord...")
     forum_webhook_url = WEBHOOKS.get("forum")
     if not forum_webhook_url: print("Warning: Discord forum webhook not set."); return
+    timestamp = datetime.now(timezone.utc).isoformat()
+    # Posted in order so forum threads follow the play ranking; post_to_webhook paces to Discord's limit.
     for play in plays_data:
-        score = float(play.get('confidence_score', 0.0))
         ticker = play.get('ticker', 'N/A')
-        if score >= 8.0: tag_id, color, emoji = WEBHOOKS.get("tag_id_high"), 0x00C775, "🚀"
-        elif score >= 4.0: tag_id, color, emoji = WEBHOOKS.get("tag_id_medium"), 0xFFFF00, "🤔"
-        else: tag_id, color, emoji = WEBHOOKS.get("tag_id_low"), 0xFF0000, "⛔️"
-        thread_name = f"{ticker} | Confidence: {score:.1f} | {emoji}"
-        embed = {"title": play.get('title', 'No Title'), "description": play.get('briefing', 'No briefing available.'), "color": color, "fields": [{"name": "The Community-Vetted Play", "value": play.get('the_play', 'N/A'), "inline": False}, {"name": "Source", "value": f"r/{play.get('subreddit', 'N/A')}", "inline": True}, {"name": "Link", "value": f"[View Post]({play.get('url', '#')})", "inline": True}], "timestamp": datetime.now(timezone.utc).isoformat(), "footer": {"text": "Vulture Analysis"}}
-        payload = {"thread_name": thread_name, "embeds": [embed], "applied_tags": [tag_id] if tag_id else []}
         try:
-            requests.post(f"{forum_webhook_url}?wait=True", json=payload, timeout=15).raise_for_status()
+            post_to_webhook(forum_webhook_url, _build_play_payload(play, timestamp), timeout=15)
             print(f"Successfully posted play for {ticker} to Discord.")
         except requests.exceptions.RequestException as e:
             print(f"Failed to create Discord forum post for {ticker}: {e}")
-        time.sleep(2)
 
 def find_daily_discussion_thread():
     print("Searching for the daily discussion thread on r/wallstreetbets...")
@@ -236,12 +630,13 @@ def find_daily_discussion_thread():
 def analyze_discussion_comments(post):
     print(f"Analyzing comments for '{post.title}'...")
     post.comment_sort = "top"
+    post.comments.replace_more(limit=0)
     comments = [comment.body for comment in post.comments[:50] if not comment.stickied]
     comments_text = "\n".join(comments)
     system_prompt = "You are a market sentiment analyst..."
     user_prompt = f"Here are the top comments:\n\n{comments_text}"
     try:
-        response = openai_client.chat.completions.create(model="gpt-4o", messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}], temperature=0.7)
+        response = get_openai_client().chat.completions.create(model="gpt-4o", messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}], temperature=0.7)
         return response.choices[0].message.content.strip(), comments
     except Exception as e:
         print(f"An error occurred during comment analysis: {e}"); return None, []
@@ -253,7 +648,7 @@ def post_daily_summary(sentiment_summary):
     if not news_webhook_url: print("Warning: News webhook not set."); return
     embed = {"title": "Vulture Daily Market Briefing", "description": sentiment_summary, "color": 0x0077be, "footer": {"text": "For informational purposes only. Not financial advice."}, "timestamp": datetime.now(timezone.utc).isoformat()}
     try:
-        requests.post(news_webhook_url, json={"embeds": [embed]}, timeout=10).raise_for_status()
+        post_to_webhook(news_webhook_url, {"embeds": [embed]}, timeout=10)
         print("Successfully posted daily summary.")
     except Exception as e:
         print(f"An error occurred posting the summary: {e}")
@@ -262,59 +657,73 @@ def run_reddit_scan():
     """Main pipeline for the Reddit community scan feature."""
     print("--- Vulture Reddit Scan triggered ---")
     today_str = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-    last_run_date_file = os.path.join(OUTPUT_DIR, "daily_summary_log.txt")
-    last_run_date = ""
-    if os.path.exists(last_run_date_file):
-        with open(last_run_date_file, 'r') as f: last_run_date = f.read().strip()
+    try:
+        with open(DAILY_SUMMARY_LOG_FILE, 'r') as f: last_run_date = f.read().strip()
+    except FileNotFoundError:
+        last_run_date = ""
     is_first_run_of_day = (last_run_date != today_str)
-    processed_ids = load_processed_ids()
-    new_posts = scrape_new_posts(TARGET_SUBREDDITS, processed_ids)
-    if not new_posts: print("Scan finished: No new posts to process."); return
+    new_posts, newest_seen = scrape_new_posts(TARGET_SUBREDDITS, load_last_seen())
+    if not new_posts: save_last_seen(newest_seen); print("Scan finished: No new posts to process."); return
     
-    analyzed_plays, newly_processed_ids = [], []
-    for post in new_posts:
-        comments = get_comments_for_post(post['id'])
-        analysis = get_ai_synthesis(post, comments)
+    analyzed_plays, newly_processed_ids = [], [post['id'] for post in new_posts]
+    # Stage 0: posts that never name a ticker can't yield a play, so skip them before spending any API calls.
+    ticker_posts = [post for post in new_posts if likely_ticker(f"{post['title']} {post['selftext']}")]
+    print(f"Ticker pre-filter kept {len(ticker_posts)} of {len(new_posts)} posts.")
+    # Stage 1: cheap triage on title/body. Posts whose triage failed are kept rather than silently dropped.
+    triage = quick_triage(ticker_posts)
+    candidates = [post for post, t in zip(ticker_posts, triage) if t is None or float(t.get('confidence_score', 0)) >= TRIAGE_THRESHOLD]
+    print(f"Triage kept {len(candidates)} of {len(ticker_posts)} posts for full analysis.")
+    # Stage 2: fetch comments and batch-analyze the surviving posts, overlapping Reddit and OpenAI I/O.
+    analyses = synthesize_posts(candidates)
+    for post, analysis in zip(candidates, analyses):
         if analysis:
             full_play_data = {**post, **analysis}
-            if float(full_play_data.get('confidence_score', 0)) > 0 and full_play_data.get('ticker', 'N/A').upper() not in ['N/A', 'MULTI_STOCK']:
+            ticker = full_play_data.get('ticker')
+            if float(full_play_data.get('confidence_score', 0)) > 0 and ticker and ticker.upper() not in INVALID_TICKERS:
                 analyzed_plays.append(full_play_data)
-        newly_processed_ids.append(post['id'])
     
     if not analyzed_plays: 
         print("No actionable plays found after analysis."); 
     else:
-        df = pd.DataFrame(analyzed_plays)
-        df.sort_values(by=['score', 'num_comments'], ascending=False, inplace=True)
-        final_plays = df.drop_duplicates(subset=['title'], keep='first').to_dict(orient='records')
+        # Keep the most upvoted/discussed play per title (normalized, so trivially different reposts collapse).
+        final_plays_by_title = {}
+        for play in sorted(analyzed_plays, key=lambda p: (p['score'], p['num_comments']), reverse=True):
+            final_plays_by_title.setdefault(play['title'].strip().lower(), play)
+        final_plays = list(final_plays_by_title.values())
         
         post_plays_to_discord(final_plays)
         
         rows_to_save = []
+        analyzed_at = datetime.now(timezone.utc).isoformat()
         for play in final_plays:
             rows_to_save.append([
                 play.get('id'), play.get('ticker'), play.get('briefing'),
                 play.get('the_play'), play.get('confidence_score'),
                 play.get('url'), play.get('subreddit'), play.get('created_utc'),
-                datetime.now(timezone.utc).isoformat()
+                analyzed_at
             ])
-        write_to_sheet(os.getenv("GOOGLE_SHEET_NAME"), "Vulture Data", rows_to_save)
+        queue_sheet_write(os.getenv("GOOGLE_SHEET_NAME"), "Vulture Data", rows_to_save)
 
     save_processed_ids(newly_processed_ids)
+    save_last_seen(newest_seen)
     
-    if is_first_run_of_day:
-        daily_thread = find_daily_discussion_thread()
-        if daily_thread:
-            sentiment_summary, raw_comments = analyze_discussion_comments(daily_thread)
-            if sentiment_summary:
-                post_daily_summary(sentiment_summary)
-                training_rows = [[
-                    daily_thread.id, daily_thread.title, "\n".join(raw_comments),
-                    sentiment_summary, datetime.now(timezone.utc).isoformat()
-                ]]
-                write_to_sheet(os.getenv("GOOGLE_SHEET_NAME"), os.getenv("GOOGLE_TRAINING_SHEET_NAME"), training_rows)
-        with open(last_run_date_file, 'w') as f: f.write(today_str)
-        print("First run of the day complete.")
+    try:
+        if is_first_run_of_day:
+            daily_thread = find_daily_discussion_thread()
+            if daily_thread:
+                sentiment_summary, raw_comments = analyze_discussion_comments(daily_thread)
+                if sentiment_summary:
+                    post_daily_summary(sentiment_summary)
+                    training_rows = [[
+                        daily_thread.id, daily_thread.title, "\n".join(raw_comments),
+                        sentiment_summary, datetime.now(timezone.utc).isoformat()
+                    ]]
+                    queue_sheet_write(os.getenv("GOOGLE_SHEET_NAME"), os.getenv("GOOGLE_TRAINING_SHEET_NAME"), training_rows)
+            _write_atomic(DAILY_SUMMARY_LOG_FILE, today_str)
+            print("First run of the day complete.")
+    finally:
+        # Write the queued plays and training rows even if the daily summary step failed.
+        flush_sheet_writes()
     print("--- Vulture Reddit Scan Complete ---")
 
 # ---------------------------
@@ -330,14 +739,13 @@ def run_news_scan():
             print("No news found or unexpected format from API."); return
         print(f"Fetched {len(news)} news articles.")
         
-        rows_to_append = []
-        for article in news[:50]:
-            dt = article.get('datetime')
-            iso_date = datetime.fromtimestamp(dt).isoformat() if dt else None
-            rows_to_append.append([
-                article.get('id'), iso_date, article.get('headline'),
-                article.get('summary'), article.get('source'), article.get('url')
-            ])
+        rows_to_append = [
+            [
+                article.get('id'), datetime.fromtimestamp(article['datetime']).isoformat() if article.get('datetime') else None,
+                article.get('headline'), article.get('summary'), article.get('source'), article.get('url')
+            ]
+            for article in news[:50]
+        ]
         
         spreadsheet_name = os.getenv("GOOGLE_SHEET_NAME")
         worksheet_name = os.getenv("GOOGLE_NEWS_SHEET_NAME")
@@ -391,14 +799,36 @@ def post_weekly_earnings_summary(earnings_data):
     }
     
     try:
-        requests.post(news_webhook_url, json={"embeds": [embed]}, timeout=10).raise_for_status()
+        post_to_webhook(news_webhook_url, {"embeds": [embed]}, timeout=10)
         print("Successfully posted weekly earnings summary to Discord.")
     except Exception as e:
         print(f"An error occurred posting the earnings summary: {e}")
 
 
+def fetch_economic_calendar_csv(url):
+    """Downloads the economic calendar CSV, reusing the saved copy when Alpha Vantage answers 304 Not Modified."""
+    headers = {}
+    if os.path.exists(ECON_CALENDAR_CSV_FILE):
+        try:
+            with open(ECON_CALENDAR_ETAG_FILE, 'r') as f: etag = f.read().strip()
+            if etag: headers["If-None-Match"] = etag
+        except FileNotFoundError:
+            pass
+    r = _http.get(url, headers=headers, timeout=30)
+    if r.status_code == 304:
+        print("Economic calendar unchanged since last download; using the cached copy.")
+        with open(ECON_CALENDAR_CSV_FILE, 'rb') as f: return f.read()
+    r.raise_for_status()
+    # The ETag is only ever saved next to the complete CSV it describes.
+    if os.path.exists(ECON_CALENDAR_ETAG_FILE): os.remove(ECON_CALENDAR_ETAG_FILE)
+    _write_atomic(ECON_CALENDAR_CSV_FILE, r.content)
+    etag = r.headers.get("ETag")
+    if etag: _write_atomic(ECON_CALENDAR_ETAG_FILE, etag)
+    return r.content
+
 def run_calendar_scan():
     """Fetches economic and earnings calendars and updates Google Sheets/Discord."""
+    import pandas as pd  # Only the calendar scan needs pandas; keep it off the reddit/news cold-start path.
     print("--- Vulture Calendar Scan triggered ---")
     
     is_monday = (datetime.now(timezone.utc).weekday() == 0)
@@ -424,10 +854,9 @@ def run_calendar_scan():
         api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
         # Alpha Vantage provides this data as a direct CSV download
         url = f'https://www.alphavantage.co/query?function=ECONOMIC_CALENDAR&horizon=3month&apikey={api_key}'
-        r = requests.get(url)
-        r.raise_for_status()
+        csv_bytes = fetch_economic_calendar_csv(url)
         
-        df_econ = pd.read_csv(io.StringIO(r.text))
+        df_econ = pd.read_csv(io.BytesIO(csv_bytes))  # Raw bytes: the C parser decodes them itself, with no str round-trip.
 
         if df_econ.empty:
             print("No economic events found from Alpha Vantage."); return
@@ -435,7 +864,8 @@ def run_calendar_scan():
         print(f"Fetched {len(df_econ)} economic events.")
         
         # Filter for the next 7 days
-        df_econ['releaseTime'] = pd.to_datetime(df_econ['releaseTime'])
+        # UTC so it compares with the aware `today`; unparseable times become NaT and drop out.
+        df_econ['releaseTime'] = pd.to_datetime(df_econ['releaseTime'], format="ISO8601", utc=True, errors="coerce")
         today = datetime.now(timezone.utc)
         one_week_from_now = today + timedelta(days=7)
         df_filtered = df_econ[
@@ -462,13 +892,23 @@ def run_calendar_scan():
         traceback.print_exc()
 
 
+# ---------------------------
+# Combined Scans
+# ---------------------------
+def run_concurrent_scans(*scans):
+    """Runs independent scans in parallel threads so their network waits overlap; re-raises the first failure."""
+    with ThreadPoolExecutor(max_workers=len(scans)) as executor:
+        futures = [executor.submit(scan) for scan in scans]
+        for future in futures: future.result()
+
+
 # ---------------------------
 # Entry point for command-line execution
 # ---------------------------
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Vulture: A multi-source market intelligence tool.")
-    parser.add_argument('scan_type', choices=['reddit', 'news', 'calendar'], help="The type of scan to run.")
+    parser.add_argument('scan_type', choices=['reddit', 'news', 'calendar', 'market', 'all'], help="The type of scan to run ('market' runs news and calendar together, 'all' runs every scan).")
     
     args = parser.parse_args()
 
@@ -478,3 +918,7 @@ if __name__ == "__main__":
         run_news_scan()
     elif args.scan_type == 'calendar':
         run_calendar_scan()
+    elif args.scan_type == 'market':
+        run_concurrent_scans(run_news_scan, run_calendar_scan)
+    elif args.scan_type == 'all':
+        run_concurrent_scans(run_news_scan, run_calendar_scan, run_reddit_scan)